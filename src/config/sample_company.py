@@ -168,6 +168,100 @@ STORY_TEMPLATES = {
     }
 }
 
+# Pre-written bug reports used instead of the LLM when synthetic bugs are enabled
+BUG_TEMPLATES = [
+    {
+        "summary": "Dashboard widgets fail to load after login",
+        "description": """Dashboard widgets for {initiative} stay on a loading spinner after login, blocking users from their daily overview.
+
+Steps to Reproduce:
+1. Log in with a standard user account
+2. Open the main dashboard
+3. Wait for the widgets to load
+
+Actual Behavior:
+Widgets never finish loading and the browser console shows a 504 from the widgets endpoint.
+
+Expected Behavior:
+All configured widgets load within two seconds."""
+    },
+    {
+        "summary": "Saved workflow loses its last step",
+        "description": """Saving a workflow created for {initiative} drops the final step, so executions stop early.
+
+Steps to Reproduce:
+1. Create a workflow with at least three steps
+2. Save the workflow
+3. Reopen it from the workflow list
+
+Actual Behavior:
+The last step is missing after reopening.
+
+Expected Behavior:
+The workflow reopens with every step that was saved."""
+    },
+    {
+        "summary": "Document upload rejects valid PDF files",
+        "description": """Uploads for {initiative} reject some valid PDF files with an unsupported format error.
+
+Steps to Reproduce:
+1. Open the document upload dialog
+2. Select a PDF exported from a scanner
+3. Submit the upload
+
+Actual Behavior:
+The upload fails with "Unsupported file format".
+
+Expected Behavior:
+Any valid PDF is accepted and queued for processing."""
+    },
+    {
+        "summary": "Notifications are delivered twice",
+        "description": """Users of {initiative} receive every real-time notification twice, creating noise and duplicate follow-ups.
+
+Steps to Reproduce:
+1. Subscribe to notifications for a project
+2. Trigger an event such as a status change
+3. Check the notification panel
+
+Actual Behavior:
+Two identical notifications appear for the same event.
+
+Expected Behavior:
+Each event produces exactly one notification."""
+    },
+    {
+        "summary": "Search results ignore the date filter",
+        "description": """Search in {initiative} returns items outside the selected date range, making reports inaccurate.
+
+Steps to Reproduce:
+1. Open search and enter any query
+2. Set the date filter to the last seven days
+3. Run the search
+
+Actual Behavior:
+Results include items older than seven days.
+
+Expected Behavior:
+Only items inside the selected date range are returned."""
+    },
+    {
+        "summary": "Session expires while editing a document",
+        "description": """Long editing sessions in {initiative} expire without warning and unsaved changes are lost.
+
+Steps to Reproduce:
+1. Open a document for editing
+2. Keep editing for more than thirty minutes
+3. Save the document
+
+Actual Behavior:
+The save fails with an authentication error and the changes are discarded.
+
+Expected Behavior:
+Active editing keeps the session alive, or the user is warned before it expires."""
+    }
+]
+
 # Meeting scenarios and templates
 MEETING_SCENARIOS = {
     "standard": {
@@ -1,11 +1,19 @@
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Tuple, Awaitable, Callable, Union
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 import os
-from openai import OpenAI
+from openai import OpenAI, AsyncOpenAI
 from datetime import datetime
 import json
+import hashlib
+import re
+import sqlite3
 from dotenv import load_dotenv
 import random
 
+# Opening/closing markdown code fence around a JSON reply
+_JSON_FENCE = re.compile(r"^```(?:json)?\s*|\s*```$", re.IGNORECASE)
+
 class LLMGenerator:
     def __init__(self, api_key=None, config=None):
         # Load environment variables from .env file
@@ -21,9 +29,245 @@ class LLMGenerator:
         
         # Store config
         self.config = config or {}
+        
+        # Skip the API and return templated text (tests, dev runs, bulk generation)
+        self.fast_descriptions = self.config.get('fast_descriptions', False)
+        
+        # Concurrent requests; the client retries 429s honouring retry-after
+        llm_config = self.config.get('llm', {})
+        self.max_concurrency = llm_config.get('max_concurrency', 8)
+        self.max_retries = llm_config.get('max_retries', 5)
+        self._async_client: Optional[AsyncOpenAI] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        
+        # Offline runs can queue requests for the Batch API (half price, results within 24h)
+        self.use_batch_api = llm_config.get('use_batch_api', False)
+        self.batch_poll_interval = llm_config.get('batch_poll_interval', 30)
+        self._batch_pending: List[Tuple[Dict[str, Any], asyncio.Future]] = []
+        
+        # Reuse responses to identical ticket prompts, optionally persisted across runs
+        self.cache_responses = llm_config.get('cache_responses', False)
+        self.cache_path = llm_config.get('cache_path')
+        self._response_cache: Dict[str, str] = {}
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._cache_db: Optional[sqlite3.Connection] = None
+        if self.cache_responses and self.cache_path:
+            # Rounds run from inside an event loop use a worker thread; only one thread touches it at a time
+            self._cache_db = sqlite3.connect(self.cache_path, check_same_thread=False)
+            self._cache_db.execute("CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, content TEXT)")
+            self._response_cache = dict(self._cache_db.execute("SELECT key, content FROM responses"))
+        
+        # Ask for a ticket's description and summary in one JSON response instead of two requests
+        self.combined_summary = llm_config.get('combined_summary', False)
+        
+        # Task/subtask descriptions shorter than this are summarised locally without a request; 0 (default) always asks the LLM
+        self.local_summary_max_chars = llm_config.get('local_summary_max_chars', 0)
+
+    @property
+    def async_client(self) -> AsyncOpenAI:
+        """Async OpenAI client shared by all concurrent calls."""
+        if self._async_client is None:
+            self._async_client = AsyncOpenAI(api_key=self.api_key, max_retries=self.max_retries)
+        return self._async_client
+
+    def run_concurrently(self, coros: List[Awaitable[Any]]) -> List[Any]:
+        """Run LLM coroutines concurrently and return their results in order."""
+        if not coros:
+            return []
+        if self.fast_descriptions:
+            # Templated text never awaits a request, so no event loop is needed
+            return [self._run_inline(coro) for coro in coros]
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return self._run_round(coros)
+        # Called from inside an event loop (async callers, Jupyter); run the round on a worker thread
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(self._run_round, coros).result()
+
+    def _run_round(self, coros: List[Awaitable[Any]]) -> List[Any]:
+        """Run the coroutines on the generator's own event loop."""
+        # One loop for the generator's lifetime so the async client's connections stay usable
+        if self._loop is None:
+            self._loop = asyncio.new_event_loop()
+        results = self._loop.run_until_complete(self._gather(coros))
+        if self._cache_db:
+            self._cache_db.commit()
+        return results
+
+    @staticmethod
+    def _run_inline(coro: Awaitable[Any]) -> Any:
+        """Drive a coroutine that completes without suspending and return its result."""
+        try:
+            coro.send(None)
+        except StopIteration as stop:
+            return stop.value
+        coro.close()
+        raise RuntimeError("Coroutine awaited a request while fast_descriptions is enabled")
+
+    async def _gather(self, coros: List[Awaitable[Any]]) -> List[Any]:
+        """Await all coroutines with at most max_concurrency in flight."""
+        if self.use_batch_api:
+            return await self._gather_batched(coros)
+        
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        
+        async def bounded(coro):
+            async with semaphore:
+                return await coro
+        
+        return await asyncio.gather(*(bounded(coro) for coro in coros))
+
+    async def _gather_batched(self, coros: List[Awaitable[Any]]) -> List[Any]:
+        """Await all coroutines, flushing their queued requests as one batch whenever all are waiting."""
+        tasks = [asyncio.ensure_future(coro) for coro in coros]
+        while True:
+            await asyncio.sleep(0)
+            unfinished = [task for task in tasks if not task.done()]
+            if not unfinished:
+                break
+            # Each coroutine awaits one request at a time, so once every unfinished one has
+            # queued a request nothing else can make progress until the batch returns
+            if len(self._batch_pending) == len(unfinished):
+                await self._flush_batch()
+        # gather re-raises the first failure and marks the others' exceptions as retrieved
+        return list(await asyncio.gather(*tasks))
+
+    @staticmethod
+    def _cache_key(body: Dict[str, Any]) -> str:
+        """Hash a request body, ignoring whitespace differences in the prompts."""
+        canonical = dict(body, messages=[
+            {**message, "content": re.sub(r"\s+", " ", message["content"]).strip()}
+            for message in body["messages"]
+        ])
+        return hashlib.sha1(json.dumps(canonical, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def _store_response(self, key: str, content: str):
+        """Remember a response, adding it to the cache database if one is configured."""
+        self._response_cache[key] = content
+        if self._cache_db:
+            self._cache_db.execute("INSERT OR REPLACE INTO responses VALUES (?, ?)", (key, content))
+
+    def _complete(self, **body) -> str:
+        """Run one chat completion and return its content, using the response cache when enabled."""
+        key = self._cache_key(body) if self.cache_responses else None
+        if key in self._response_cache:
+            return self._response_cache[key]
+        
+        response = self.client.chat.completions.create(**body)
+        content = response.choices[0].message.content
+        if key:
+            self._store_response(key, content)
+            if self._cache_db:
+                self._cache_db.commit()
+        return content
+
+    async def _acomplete(self, **body) -> str:
+        """Async variant of _complete; identical requests already in flight share one call."""
+        if not self.cache_responses:
+            return await self._arequest(body)
+        
+        key = self._cache_key(body)
+        if key in self._response_cache:
+            return self._response_cache[key]
+        if self.use_batch_api:
+            # Duplicates are collapsed when the batch is flushed
+            content = await self._arequest(body)
+        else:
+            if key not in self._inflight:
+                self._inflight[key] = asyncio.ensure_future(self._arequest(body))
+            try:
+                content = await asyncio.shield(self._inflight[key])
+            finally:
+                self._inflight.pop(key, None)
+        self._store_response(key, content)
+        return content
+
+    async def _arequest(self, body: Dict[str, Any]) -> str:
+        """Send one chat completion, queueing it for the batch when enabled."""
+        if self.use_batch_api:
+            future = asyncio.get_running_loop().create_future()
+            self._batch_pending.append((body, future))
+            return await future
+        
+        response = await self.async_client.chat.completions.create(**body)
+        return response.choices[0].message.content
 
-    def generate_ticket_description(self, title: str, ticket_type: str, prompt: str = None) -> str:
-        """Generate a realistic ticket description based on the title and type."""
+    async def _flush_batch(self):
+        """Submit all queued requests through the Batch API and resolve them with the results."""
+        queued, self._batch_pending = self._batch_pending, []
+        # With the response cache on, identical bodies are sent once and their result shared
+        requests: Dict[str, Dict[str, Any]] = {}
+        waiters: Dict[str, List[asyncio.Future]] = {}
+        for body, future in queued:
+            serialized = json.dumps(body, sort_keys=True) if self.cache_responses else str(len(requests))
+            requests.setdefault(serialized, body)
+            waiters.setdefault(serialized, []).append(future)
+        pending = [(body, waiters[serialized]) for serialized, body in requests.items()]
+        try:
+            await self._run_batch(pending)
+        except BaseException as error:
+            # Fail every waiter so no task is left pending forever on the persistent loop
+            for _, futures in pending:
+                for future in futures:
+                    if future.done():
+                        continue
+                    if isinstance(error, Exception):
+                        future.set_exception(error)
+                    else:
+                        future.cancel()
+            if not isinstance(error, Exception):
+                raise
+
+    async def _run_batch(self, pending: List[Tuple[Dict[str, Any], List[asyncio.Future]]]):
+        """Upload the request bodies as one batch job, wait for it and resolve each body's futures."""
+        lines = [
+            json.dumps({
+                "custom_id": f"request-{i}",
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": body
+            })
+            for i, (body, _) in enumerate(pending)
+        ]
+        batch_file = await self.async_client.files.create(
+            file=("batch.jsonl", "\n".join(lines).encode("utf-8")),
+            purpose="batch"
+        )
+        batch = await self.async_client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h"
+        )
+        
+        while batch.status not in ("completed", "failed", "expired", "cancelled"):
+            await asyncio.sleep(self.batch_poll_interval)
+            batch = await self.async_client.batches.retrieve(batch.id)
+        if batch.status != "completed" or not batch.output_file_id:
+            raise RuntimeError(f"OpenAI batch {batch.id} ended with status {batch.status}")
+        
+        output = await self.async_client.files.content(batch.output_file_id)
+        results = {}
+        for line in output.text.splitlines():
+            if line.strip():
+                result = json.loads(line)
+                results[result["custom_id"]] = result
+        
+        for i, (_, futures) in enumerate(pending):
+            result = results.get(f"request-{i}")
+            for future in futures:
+                if result and not result.get("error") and result["response"]["status_code"] == 200:
+                    future.set_result(result["response"]["body"]["choices"][0]["message"]["content"])
+                else:
+                    future.set_exception(RuntimeError(f"OpenAI batch request request-{i} failed: {result and result.get('error')}"))
+
+    def _ticket_description_messages(self, title: str, ticket_type: str, prompt: Union[str, Callable[[], str]] = None) -> List[Dict[str, str]]:
+        """Build the chat messages for a ticket description request.
+        
+        The prompt may be a zero-argument callable, built only when a request is made.
+        """
+        if callable(prompt):
+            prompt = prompt()
         if prompt:
             system_prompt = "You are a technical writer creating detailed software development tickets. Focus on clear, concise descriptions that align with business goals and technical requirements."
             user_prompt = prompt
@@ -40,18 +284,65 @@ class LLMGenerator:
             4. Consider dependencies and technical constraints
             
             Format the response in markdown."""
+        
+        return [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt}
+        ]
 
-        response = self.client.chat.completions.create(
+    def generate_ticket_description(self, title: str, ticket_type: str, prompt: Union[str, Callable[[], str]] = None) -> str:
+        """Generate a realistic ticket description based on the title and type."""
+        if self.fast_descriptions:
+            return f"{title}: standard {ticket_type.lower()} implementation per team conventions."
+        
+        return self._complete(
             model="gpt-4",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt}
-            ],
+            messages=self._ticket_description_messages(title, ticket_type, prompt),
             temperature=0.7,
             max_tokens=500
         )
+
+    async def agenerate_ticket_description(self, title: str, ticket_type: str, prompt: Union[str, Callable[[], str]] = None) -> str:
+        """Async variant of generate_ticket_description for concurrent batches."""
+        if self.fast_descriptions:
+            return self.generate_ticket_description(title, ticket_type, prompt)
         
-        return response.choices[0].message.content
+        return await self._acomplete(
+            model="gpt-4",
+            messages=self._ticket_description_messages(title, ticket_type, prompt),
+            temperature=0.7,
+            max_tokens=500
+        )
+
+    def _ticket_payload_messages(self, title: str, ticket_type: str, prompt: Union[str, Callable[[], str]] = None) -> List[Dict[str, str]]:
+        """Build the chat messages for a combined description and summary request."""
+        messages = self._ticket_description_messages(title, ticket_type, prompt)
+        messages[-1]["content"] += """
+
+Respond with a JSON object with two string fields: "description", the ticket description in markdown, and "summary", a summary of less than 10 words with no formatting."""
+        return messages
+
+    async def agenerate_ticket_payload(self, title: str, ticket_type: str, prompt: Union[str, Callable[[], str]] = None) -> Tuple[str, str]:
+        """Generate a ticket description and its summary with a single request."""
+        if self.fast_descriptions:
+            description = self.generate_ticket_description(title, ticket_type, prompt)
+            return description, self.generate_summary(description, ticket_type)
+        
+        content = await self._acomplete(
+            model="gpt-4",
+            messages=self._ticket_payload_messages(title, ticket_type, prompt),
+            temperature=0.7,
+            max_tokens=550
+        )
+        
+        try:
+            # Models often fence the JSON and put raw newlines inside its strings
+            payload = json.loads(_JSON_FENCE.sub("", content.strip()), strict=False)
+            return payload["description"], payload["summary"].strip()
+        except (ValueError, KeyError, TypeError, AttributeError):
+            # Not usable JSON (e.g. cut off at max_tokens); request the description on its own
+            description = await self.agenerate_ticket_description(title, ticket_type, prompt)
+            return description, await self.agenerate_summary(description, ticket_type)
 
     def generate_message_content(self, channel_name: str, context: Dict[str, Any]) -> str:
         """Generate realistic message content for team communications."""
@@ -332,8 +623,8 @@ Please provide a helpful and constructive review comment that:
                f"2. Discussion Points\n" + \
                f"3. Action Items and Next Steps"
 
-    def generate_summary(self, description: str, ticket_type: str) -> str:
-        """Generate a concise summary (less than 10 words) from a ticket description using GPT-4"""
+    def _summary_messages(self, description: str, ticket_type: str) -> List[Dict[str, str]]:
+        """Build the chat messages for a ticket summary request."""
         prompt = f"""Generate a concise summary (less than 10 words) for a {ticket_type} ticket.
         The summary should capture the essence of the following description:
 
@@ -341,17 +632,50 @@ Please provide a helpful and constructive review comment that:
 
         Return ONLY the summary with no additional text, headers, or formatting. The summary must be less than 10 words."""
         
-        response = self.client.chat.completions.create(
+        return [
+            {"role": "system", "content": "You are a technical writer creating concise ticket summaries. Return ONLY the summary with no additional content."},
+            {"role": "user", "content": prompt}
+        ]
+
+    def _summarise_locally(self, description: str, ticket_type: str) -> bool:
+        """Whether a summary can be derived locally instead of requested."""
+        return ticket_type in ("Task", "Subtask") and len(description) < self.local_summary_max_chars
+
+    @staticmethod
+    def _local_summary(description: str) -> str:
+        """Summarise a short description as its first sentence, cut to nine words."""
+        first_sentence = re.split(r"[.!?]\s|\n", description.strip(), maxsplit=1)[0]
+        return " ".join(first_sentence.strip(" #*").split()[:9])
+
+    def generate_summary(self, description: str, ticket_type: str) -> str:
+        """Generate a concise summary (less than 10 words) from a ticket description using GPT-4"""
+        if self.fast_descriptions:
+            return " ".join(description.split()[:9])
+        if self._summarise_locally(description, ticket_type):
+            return self._local_summary(description)
+        
+        content = self._complete(
             model="gpt-4",
-            messages=[
-                {"role": "system", "content": "You are a technical writer creating concise ticket summaries. Return ONLY the summary with no additional content."},
-                {"role": "user", "content": prompt}
-            ],
+            messages=self._summary_messages(description, ticket_type),
             temperature=0.7,
             max_tokens=50
         )
         
-        return response.choices[0].message.content.strip()
+        return content.strip()
+
+    async def agenerate_summary(self, description: str, ticket_type: str) -> str:
+        """Async variant of generate_summary for concurrent batches."""
+        if self.fast_descriptions or self._summarise_locally(description, ticket_type):
+            return self.generate_summary(description, ticket_type)
+        
+        content = await self._acomplete(
+            model="gpt-4",
+            messages=self._summary_messages(description, ticket_type),
+            temperature=0.7,
+            max_tokens=50
+        )
+        
+        return content.strip()
 
     def extract_acceptance_criteria(self, description: str) -> List[str]:
         """Extract acceptance criteria from a ticket description."""
@@ -566,8 +890,8 @@ Please provide a helpful and constructive review comment that:
         
         return task_content, story_points
 
-    def generate_subtask(self, task_description: str, task_id: str, parent_task: Dict[str, Any] = None) -> Tuple[str, int]:
-        """Generate a subtask description and story points."""
+    def _subtask_messages(self, task_description: str, task_id: str) -> List[Dict[str, str]]:
+        """Build the chat messages for a subtask request."""
         prompt = f"""Generate a subtask description for a software development task with the following context:
         Parent Task: {task_description}
         Parent Task ID: {task_id}
@@ -580,23 +904,42 @@ Please provide a helpful and constructive review comment that:
         
         Format the response in markdown."""
 
-        response = self.client.chat.completions.create(
+        return [
+            {"role": "system", "content": "You are a technical writer creating subtask descriptions for software development tasks."},
+            {"role": "user", "content": prompt}
+        ]
+
+    def generate_subtask(self, task_description: str, task_id: str, parent_task: Dict[str, Any] = None) -> Tuple[str, int]:
+        """Generate a subtask description and story points."""
+        if self.fast_descriptions:
+            return f"Sub-task for {task_id}: standard implementation per team conventions.", random.choice([1, 2, 3])
+        
+        subtask_content = self._complete(
             model="gpt-4",
-            messages=[
-                {"role": "system", "content": "You are a technical writer creating subtask descriptions for software development tasks."},
-                {"role": "user", "content": prompt}
-            ],
+            messages=self._subtask_messages(task_description, task_id),
             temperature=0.7,
             max_tokens=500
         )
         
-        subtask_content = response.choices[0].message.content
-        
         # Generate story points (1, 2, 3)
         story_points = random.choice([1, 2, 3])
         
         return subtask_content, story_points
 
+    async def agenerate_subtask(self, task_description: str, task_id: str, parent_task: Dict[str, Any] = None) -> Tuple[str, int]:
+        """Async variant of generate_subtask for concurrent batches."""
+        if self.fast_descriptions:
+            return self.generate_subtask(task_description, task_id, parent_task)
+        
+        content = await self._acomplete(
+            model="gpt-4",
+            messages=self._subtask_messages(task_description, task_id),
+            temperature=0.7,
+            max_tokens=500
+        )
+        
+        return content, random.choice([1, 2, 3])
+
     def generate_bug(self) -> Tuple[str, int]:
         """Generate a bug description and story points."""
         prompt = """Generate a bug report for a software development task.
@@ -1,9 +1,18 @@
-from typing import Dict, List, Optional, Tuple, Union
+from typing import Callable, Dict, Iterator, List, Mapping, Optional, Tuple, Union
+from collections import defaultdict
 from datetime import datetime, timedelta
+from functools import partial
+from operator import attrgetter
+from types import MappingProxyType
 import random
+import re
 import uuid
 import json
-import os
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 from src.models.ticket import (
     Ticket, Epic, Story, Task, Subtask, Bug,
@@ -12,15 +21,111 @@ from src.models.ticket import (
 )
 from src.models.team import TeamMember, Team, Department, Role, Seniority, Skill
 from src.generators.utils import (
-    generate_id, generate_ticket_id, random_date_between,
+    generate_ticket_id, random_date_between,
     weighted_choice, generate_paragraph, random_subset
 )
-from src.config.sample_company import INNOVATECH_CONFIG, PRODUCT_INITIATIVES, PRODUCT_SCENARIOS, STORY_TEMPLATES
+from src.config.sample_company import INNOVATECH_CONFIG, PRODUCT_INITIATIVES, PRODUCT_SCENARIOS, STORY_TEMPLATES, BUG_TEMPLATES
 from src.generators.llm_generator import LLMGenerator
 
+# LLM prompts per ticket type, filled with str.format by the _*_prompt helpers
+PROMPT_TEMPLATES = {
+    "Epic": """Write an epic description for a software project.
+Initiative: {initiative}
+Objectives: {objectives}
+Success Metrics: {success_metrics}
+Cover goals, challenges and implementation approach; realistic, specific to the initiative, not tied to one codebase.""",
+    "Story": """Write a user story for a software project.
+Initiative: {initiative}
+Epic Description: {epic_description}
+Start with "As a [type of user], I want [goal] so that [benefit]", then list acceptance criteria; stay within the epic's goals and scope.""",
+    "Bug": """Write a bug report for a software project.
+Initiative: {initiative}
+Describe the issue and its impact, then add sections headed "Steps to Reproduce:", "Actual Behavior:" and "Expected Behavior:".""",
+    "Task": """Write a technical task description for a software project.
+Initiative: {initiative}
+Cover implementation details, requirements and technical considerations; realistic and actionable.""",
+}
+
+# Reasons given to tickets marked as blocked
+BLOCKING_REASONS = (
+    "Waiting for external API documentation",
+    "Pending security review",
+    "Infrastructure upgrade required",
+    "Dependent service not yet available",
+    "Awaiting client feedback",
+    "Technical debt needs to be addressed first",
+    "Resource constraints"
+)
+
+# Forward relation -> reverse relation recorded on the target ticket
+_REVERSE_RELATIONS = {
+    TicketRelationType.BLOCKS: TicketRelationType.BLOCKED_BY,
+    TicketRelationType.CLONES: TicketRelationType.CLONED_BY,
+    TicketRelationType.DUPLICATES: TicketRelationType.DUPLICATED_BY,
+    TicketRelationType.IMPLEMENTS: TicketRelationType.IMPLEMENTED_BY,
+    TicketRelationType.DEPENDS_ON: TicketRelationType.REQUIRED_FOR
+}
+
+# Ticket attribute (and relationship_notes key) holding each relation type's ids
+_RELATION_ATTRS = {relation: relation.value.replace(" ", "_") for relation in TicketRelationType}
+
+# Relation attributes that exist as Ticket fields (there is no relates_to list)
+_TICKET_RELATION_ATTRS = tuple(attr for attr in _RELATION_ATTRS.values() if attr in Ticket.model_fields)
+
+# Relation type -> (forward list getter, reverse list getter), built once at import
+_RELATION_DISPATCH = {
+    relation: (attrgetter(_RELATION_ATTRS[relation]), attrgetter(_RELATION_ATTRS[reverse]))
+    for relation, reverse in _REVERSE_RELATIONS.items()
+}
+
+# One bit per component so component sets compare as integers
+_COMPONENT_BITS = {component: 1 << i for i, component in enumerate(Component)}
+
+def _component_mask(components: List[Component]) -> int:
+    """Encode a ticket's components as a bitmask."""
+    mask = 0
+    for component in components:
+        mask |= _COMPONENT_BITS[component]
+    return mask
+
+def _read_json(path: str):
+    """Parse a JSON file, using orjson when it is installed; a missing file reads as empty."""
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+    except FileNotFoundError:
+        return []
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+# Bug report section header lines; a header line's own text is dropped, as before
+_BUG_SECTION_HEADER = re.compile(
+    r"^(.*(?:Steps to Reproduce|Current Behavior|Actual Behavior|Expected Behavior):.*)$", re.M
+)
+# Checked in order, so a line naming two headers keeps the earlier one's section
+_BUG_SECTIONS = {
+    "Steps to Reproduce:": "steps",
+    "Current Behavior:": "actual",
+    "Actual Behavior:": "actual",
+    "Expected Behavior:": "expected",
+}
+
+def _parse_bug_sections(description: str) -> Dict[str, List[str]]:
+    """Split a bug description into its non-blank, stripped section lines."""
+    sections = {"steps": [], "actual": [], "expected": []}
+    parts = _BUG_SECTION_HEADER.split(description)
+    for header_line, body in zip(parts[1::2], parts[2::2]):
+        section = next(section for header, section in _BUG_SECTIONS.items() if header in header_line)
+        sections[section].extend(
+            line.strip() for line in body.split('\n') if line.strip()
+        )
+    return sections
+
 class TicketGenerator:
     def __init__(self, config: dict):
         self.config = config
+        
+        # Private random stream; a config seed makes generation reproducible
+        self.rng = random.Random(config.get('seed'))
         self.team_members: Dict[str, TeamMember] = {}
         self.teams: Dict[str, Team] = {}
         self.tickets: Dict[str, Ticket] = {}
@@ -30,17 +135,31 @@ class TicketGenerator:
         self.subtasks: Dict[str, Subtask] = {}
         self.bugs: Dict[str, Bug] = {}
         self.sprints: Dict[str, Sprint] = {}
+        
+        # Indexes behind the query methods, kept in sync as tickets and sprints are added and updated
+        self._all_tickets: Dict[str, Ticket] = {}
+        self._tickets_by_sprint: Dict[str, List[Ticket]] = {}
+        self._tickets_by_status: Dict[TicketStatus, Dict[str, Ticket]] = {}
+        self._sprints_by_team: Dict[str, List[Sprint]] = {}
+        
         self.ticket_counter = 1
         self.sprint_counter = 1
+        self.comment_counter = 1
+        
+        # Wall clock shared by everything generate_ticket_hierarchy creates; None reads the live clock
+        self._run_now: Optional[datetime] = None
+        
         self.fix_versions: Dict[str, FixVersion] = self._generate_fix_versions()
         
         # Default ticket generation parameters
-        self.stories_per_sprint = random.randint(2, 4)
-        self.tasks_per_story = random.randint(2, 4)
-        self.subtasks_per_task = random.randint(1, 3)
+        self.stories_per_sprint = self.rng.randint(2, 4)
+        self.tasks_per_story = self.rng.randint(2, 4)
+        self.subtasks_per_task = self.rng.randint(1, 3)
         
         # Product initiative
         self.current_initiative = None
+        self._current_initiative_fields: Optional[Tuple[object, Dict[str, str]]] = None
+        self._prompt_cache: Dict[Tuple[str, str], str] = {}
         
         # Relationship probabilities
         self.dependency_probability = 0.3  # 30% chance of dependencies between stories
@@ -50,67 +169,82 @@ class TicketGenerator:
         self.implements_probability = 0.2  # 20% chance of implementation relationships
 
         self.llm = LLMGenerator(config=config)
+        
+        # Template descriptions instead of LLM calls when realistic prose isn't needed
+        self.fast_descriptions = config.get('fast_descriptions', False)
+        self.llm.fast_descriptions = self.fast_descriptions
+        
+        # Fill bugs from BUG_TEMPLATES instead of the LLM
+        self.synthetic_bugs = config.get('llm', {}).get('synthetic_bugs', False)
 
         self.sprint_duration_days = config.get('sprint_duration_days', 14)  # Default to 2 weeks
         
         # Load JIRA data
         self._load_jira_data()
+        self._index_members()
+
+    def _index_members(self):
+        """Rebuild the member lookups; call again whenever team_members or teams change."""
+        # First team of each member, replacing a scan of every team per ticket
+        self._member_teams: Dict[str, str] = {}
+        for team in self.teams.values():
+            for member in team.members:
+                self._member_teams.setdefault(member.id, team.id)
+        
+        # Member ids for random assignment
+        self._member_ids: List[str] = list(self.team_members)
 
     def _load_jira_data(self):
         """Load team and user data from JIRA JSON files."""
         # Load users data first
         users_file = "user_data/jira_users_20250328_104736.json"
-        if os.path.exists(users_file):
-            with open(users_file, 'r') as f:
-                users_data = json.load(f)
-                for user_data in users_data:
-                    # Generate a valid email if none exists
-                    email = user_data.get('emailAddress')
-                    if not email:
-                        email = f"{user_data['displayName'].lower().replace(' ', '.')}@company.com"
-                    
-                    team_member = TeamMember(
-                        id=user_data['accountId'],
-                        name=user_data['displayName'],
-                        email=email,
-                        role=user_data.get('role'),
-                        active=user_data.get('active', True),
-                        timezone=user_data.get('timeZone'),
-                        locale=user_data.get('locale')
-                    )
-                    self.team_members[team_member.id] = team_member
+        users_data = _read_json(users_file)
+        for user_data in users_data:
+            # Generate a valid email if none exists
+            email = user_data.get('emailAddress')
+            if not email:
+                email = f"{user_data['displayName'].lower().replace(' ', '.')}@company.com"
+            
+            team_member = TeamMember(
+                id=user_data['accountId'],
+                name=user_data['displayName'],
+                email=email,
+                role=user_data.get('role'),
+                active=user_data.get('active', True),
+                timezone=user_data.get('timeZone'),
+                locale=user_data.get('locale')
+            )
+            self.team_members[team_member.id] = team_member
         
         # Load teams data
         teams_file = "user_data/jira_teams_20250328_104736.json"
-        if os.path.exists(teams_file):
-            with open(teams_file, 'r') as f:
-                teams_data = json.load(f)
-                for team_data in teams_data:
-                    # Get team members
-                    team_members_list = []
-                    for member_data in team_data.get('members', []):
-                        member_id = member_data.get('accountId')
-                        if member_id and member_id in self.team_members:
-                            member = self.team_members[member_id]
-                            team_members_list.append(member)
-                    
-                    team = Team(
-                        id=team_data['id'],
-                        name=team_data['name'],
-                        description=team_data.get('description', ''),
-                        team_type=team_data.get('teamType', 'MEMBER_INVITE'),
-                        members=team_members_list
-                    )
-                    self.teams[team.id] = team
+        teams_data = _read_json(teams_file)
+        for team_data in teams_data:
+            # Get team members
+            team_members_list = []
+            for member_data in team_data.get('members', []):
+                member_id = member_data.get('accountId')
+                if member_id and member_id in self.team_members:
+                    member = self.team_members[member_id]
+                    team_members_list.append(member)
+            
+            team = Team(
+                id=team_data['id'],
+                name=team_data['name'],
+                description=team_data.get('description', ''),
+                team_type=team_data.get('teamType', 'MEMBER_INVITE'),
+                members=team_members_list
+            )
+            self.teams[team.id] = team
 
     def _generate_fix_versions(self) -> Dict[str, FixVersion]:
         """Generate fix versions for the project."""
         versions = {}
-        current_date = datetime.now()
+        current_date = self._now()
         
         # Generate past versions
         for i in range(1, 4):  # v1.0.0 to v1.2.0
-            version_id = generate_id("VER")
+            version_id = self._seeded_id("VER")
             version = FixVersion(
                 id=version_id,
                 name=f"v1.{i-1}.0",
@@ -121,7 +255,7 @@ class TicketGenerator:
             versions[version_id] = version
         
         # Generate current version
-        current_version_id = generate_id("VER")
+        current_version_id = self._seeded_id("VER")
         versions[current_version_id] = FixVersion(
             id=current_version_id,
             name="v1.3.0",
@@ -132,7 +266,7 @@ class TicketGenerator:
         
         # Generate future versions
         for i in range(4, 6):  # v1.4.0 to v1.5.0
-            version_id = generate_id("VER")
+            version_id = self._seeded_id("VER")
             version = FixVersion(
                 id=version_id,
                 name=f"v1.{i}.0",
@@ -144,35 +278,64 @@ class TicketGenerator:
         
         return versions
 
+    def _seeded_id(self, prefix: str, namespace: str = "") -> str:
+        """Generate a generate_id-style identifier drawn from the seeded random stream.
+        
+        The namespace (e.g. a team id) keeps ids distinct across generators
+        that share a seed and are merged afterwards.
+        """
+        bits = self.rng.getrandbits(128)
+        if namespace:
+            return f"{prefix}{uuid.uuid5(uuid.NAMESPACE_OID, f'{namespace}:{bits}').hex[:8]}"
+        return f"{prefix}{uuid.UUID(int=bits).hex[:8]}"
+
+    def _now(self) -> datetime:
+        """Return the current run's timestamp, or the live clock outside a hierarchy run."""
+        return self._run_now or datetime.now()
+
+    def _member_pool(self) -> List[str]:
+        """Return the member ids to draw from, indexing members added after construction."""
+        if not self._member_ids:
+            self._index_members()
+            if not self._member_ids:
+                raise ValueError("No team members available for assignment")
+        return self._member_ids
+
     def _assign_team_member(self) -> Tuple[str, str]:
         """Assign a random team member as reporter and assignee."""
-        if not self.team_members:
-            raise ValueError("No team members available for assignment")
-        reporter = random.choice(list(self.team_members.values()))
-        assignee = random.choice(list(self.team_members.values()))
-        return reporter.id, assignee.id
-
-    def generate_epic(self) -> Epic:
-        """Generate an epic ticket."""
+        reporter_id, assignee_id = self.rng.choices(self._member_pool(), k=2)
+        return reporter_id, assignee_id
+
+    def generate_epic(
+        self,
+        title: Optional[str] = None,
+        description: Optional[str] = None,
+        summary: Optional[str] = None
+    ) -> Epic:
+        """Generate an epic ticket.
+        
+        A pre-generated description and summary skip the corresponding LLM calls.
+        """
         epic_id = f"EPIC-{self.ticket_counter}"
         self.ticket_counter += 1
+        now = self._now()
         reporter_id, assignee_id = self._assign_team_member()
         
         # Get team_id from the assignee
-        team_id = None
-        for team in self.teams.values():
-            if any(member.id == assignee_id for member in team.members):
-                team_id = team.id
-                break
+        team_id = self._member_teams.get(assignee_id)
         
         # Generate epic description using LLM
-        epic_description = self._generate_epic_description(
-            self.current_initiative,
-            PRODUCT_SCENARIOS
-        )
+        epic_description = description
+        if epic_description is None:
+            epic_description = self._generate_epic_description(
+                self.current_initiative,
+                PRODUCT_SCENARIOS,
+                title=title
+            )
         
         # Generate a concise summary using LLM
-        summary = self.llm.generate_summary(epic_description, "Epic")
+        if summary is None:
+            summary = self.llm.generate_summary(epic_description, "Epic")
         
         epic = Epic(
             id=epic_id,
@@ -183,36 +346,47 @@ class TicketGenerator:
             reporter_id=reporter_id,
             assignee_id=assignee_id,
             team_id=team_id,
-            story_points=random.randint(8, 13),
-            created_at=datetime.now(),
-            updated_at=datetime.now()
+            story_points=self.rng.randint(8, 13),
+            created_at=now,
+            updated_at=now
         )
         
         self.epics[epic_id] = epic
+        self._register_ticket(epic)
         return epic
 
-    def generate_story(self, epic: Epic) -> Story:
-        """Generate a story ticket."""
+    def generate_story(
+        self,
+        epic: Epic,
+        title: Optional[str] = None,
+        description: Optional[str] = None,
+        summary: Optional[str] = None
+    ) -> Story:
+        """Generate a story ticket.
+        
+        A pre-generated description and summary skip the corresponding LLM calls.
+        """
         story_id = f"STORY-{self.ticket_counter}"
         self.ticket_counter += 1
+        now = self._now()
         reporter_id, assignee_id = self._assign_team_member()
         
         # Get team_id from the assignee
-        team_id = None
-        for team in self.teams.values():
-            if any(member.id == assignee_id for member in team.members):
-                team_id = team.id
-                break
+        team_id = self._member_teams.get(assignee_id)
         
         # Generate story description using LLM with epic context
-        story_description = self._generate_story_description(
-            PRODUCT_SCENARIOS,
-            self.current_initiative,
-            epic.description if epic else None
-        )
+        story_description = description
+        if story_description is None:
+            story_description = self._generate_story_description(
+                PRODUCT_SCENARIOS,
+                self.current_initiative,
+                epic.description if epic else None,
+                title=title
+            )
         
         # Generate a concise summary using LLM
-        summary = self.llm.generate_summary(story_description, "Story")
+        if summary is None:
+            summary = self.llm.generate_summary(story_description, "Story")
         
         story = Story(
             id=story_id,
@@ -224,35 +398,45 @@ class TicketGenerator:
             assignee_id=assignee_id,
             team_id=team_id,
             epic_link=epic.id if epic else None,
-            story_points=random.randint(3, 8),
-            created_at=datetime.now(),
-            updated_at=datetime.now()
+            story_points=self.rng.randint(3, 8),
+            created_at=now,
+            updated_at=now
         )
         
         self.stories[story_id] = story
+        self._register_ticket(story)
         return story
 
-    def generate_task(self) -> Task:
-        """Generate a task ticket."""
+    def generate_task(
+        self,
+        title: Optional[str] = None,
+        description: Optional[str] = None,
+        summary: Optional[str] = None
+    ) -> Task:
+        """Generate a task ticket.
+        
+        A pre-generated description and summary skip the corresponding LLM calls.
+        """
         task_id = f"TASK-{self.ticket_counter}"
         self.ticket_counter += 1
+        now = self._now()
         reporter_id, assignee_id = self._assign_team_member()
         
         # Get team_id from the assignee
-        team_id = None
-        for team in self.teams.values():
-            if any(member.id == assignee_id for member in team.members):
-                team_id = team.id
-                break
+        team_id = self._member_teams.get(assignee_id)
         
         # Generate task description using LLM
-        task_description = self._generate_task_description(
-            PRODUCT_SCENARIOS,
-            self.current_initiative
-        )
+        task_description = description
+        if task_description is None:
+            task_description = self._generate_task_description(
+                PRODUCT_SCENARIOS,
+                self.current_initiative,
+                title=title
+            )
         
         # Generate a concise summary using LLM
-        summary = self.llm.generate_summary(task_description, "Task")
+        if summary is None:
+            summary = self.llm.generate_summary(task_description, "Task")
         
         task = Task(
             id=task_id,
@@ -263,31 +447,43 @@ class TicketGenerator:
             reporter_id=reporter_id,
             assignee_id=assignee_id,
             team_id=team_id,
-            story_points=random.randint(2, 5),
-            created_at=datetime.now(),
-            updated_at=datetime.now()
+            story_points=self.rng.randint(2, 5),
+            created_at=now,
+            updated_at=now
         )
         
         self.tasks[task_id] = task
+        self._register_ticket(task)
         return task
 
-    def generate_subtask(self, task: Task) -> Subtask:
-        """Generate a subtask within a task."""
+    def generate_subtask(
+        self,
+        task: Task,
+        content: Optional[Tuple[str, int]] = None,
+        summary: Optional[str] = None
+    ) -> Subtask:
+        """Generate a subtask within a task.
+        
+        A pre-generated (description, story_points) pair and summary skip the
+        corresponding LLM calls; story points are always drawn from self.rng.
+        """
         subtask_id = generate_ticket_id("SUBTASK", self.ticket_counter)
         self.ticket_counter += 1
+        now = self._now()
         
-        # Get parent task information
-        parent_task_dict = task.dict() if task else None
-        
-        # Generate subtask content using GPT-4 with context
-        subtask_description, story_points = self.llm.generate_subtask(
-            task_description=task.description if task else "",
-            task_id=task.id if task else "",
-            parent_task=parent_task_dict
-        )
+        if content is None:
+            # Generate subtask content using GPT-4 with context
+            content = self.llm.generate_subtask(
+                task_description=task.description if task else "",
+                task_id=task.id if task else ""
+            )
+        # Story points come from the seeded rng, not the LLM helper's module-level random
+        subtask_description = content[0]
+        story_points = self.rng.choice((1, 2, 3))
         
         # Generate a concise summary using LLM
-        summary = self.llm.generate_summary(subtask_description, "Subtask")
+        if summary is None:
+            summary = self.llm.generate_summary(subtask_description, "Subtask")
         
         # Assign team members
         reporter_id, assignee_id = self._assign_team_member()
@@ -301,61 +497,55 @@ class TicketGenerator:
             parent_ticket=task.id if task else None,
             reporter_id=reporter_id,
             assignee_id=assignee_id,
-            created_at=datetime.now() - timedelta(days=random.randint(1, 5)),
-            updated_at=datetime.now() - timedelta(days=random.randint(1, 3)),
+            created_at=now - timedelta(days=self.rng.randint(1, 5)),
+            updated_at=now - timedelta(days=self.rng.randint(1, 3)),
             story_points=story_points,
             technical_details=None
         )
         
         self.subtasks[subtask_id] = subtask
+        self._register_ticket(subtask)
         return subtask
 
-    def generate_bug(self, related_tickets: List[str] = None) -> Bug:
-        """Generate a bug ticket."""
+    def generate_bug(
+        self,
+        related_tickets: List[str] = None,
+        title: Optional[str] = None,
+        description: Optional[str] = None,
+        summary: Optional[str] = None
+    ) -> Bug:
+        """Generate a bug ticket.
+        
+        A pre-generated description and summary skip the corresponding LLM calls.
+        """
         bug_id = f"BUG-{self.ticket_counter}"
         self.ticket_counter += 1
+        now = self._now()
         reporter_id, assignee_id = self._assign_team_member()
         
         # Get team_id from the assignee
-        team_id = None
-        for team in self.teams.values():
-            if any(member.id == assignee_id for member in team.members):
-                team_id = team.id
-                break
+        team_id = self._member_teams.get(assignee_id)
         
         # Generate bug description using LLM
-        bug_description = self._generate_bug_description(
-            PRODUCT_SCENARIOS,
-            self.current_initiative
-        )
+        bug_description = description
+        if bug_description is None and self.synthetic_bugs:
+            bug_description, summary = self._synthetic_bug()
+        if bug_description is None:
+            bug_description = self._generate_bug_description(
+                PRODUCT_SCENARIOS,
+                self.current_initiative,
+                title=title
+            )
         
         # Generate a concise summary using LLM
-        summary = self.llm.generate_summary(bug_description, "Bug")
+        if summary is None:
+            summary = self.llm.generate_summary(bug_description, "Bug")
         
         # Parse the bug description to extract steps, behaviors, etc.
-        lines = bug_description.split('\n')
-        steps_to_reproduce = []
-        actual_behavior = ""
-        expected_behavior = ""
-        
-        current_section = None
-        for line in lines:
-            if "Steps to Reproduce:" in line:
-                current_section = "steps"
-                continue
-            elif "Current Behavior:" in line or "Actual Behavior:" in line:
-                current_section = "actual"
-                continue
-            elif "Expected Behavior:" in line:
-                current_section = "expected"
-                continue
-            
-            if current_section == "steps" and line.strip():
-                steps_to_reproduce.append(line.strip())
-            elif current_section == "actual" and line.strip():
-                actual_behavior += line.strip() + "\n"
-            elif current_section == "expected" and line.strip():
-                expected_behavior += line.strip() + "\n"
+        sections = _parse_bug_sections(bug_description)
+        steps_to_reproduce = sections["steps"]
+        actual_behavior = "".join(line + "\n" for line in sections["actual"])
+        expected_behavior = "".join(line + "\n" for line in sections["expected"])
         
         # If any required fields are empty, provide default values
         if not steps_to_reproduce:
@@ -374,9 +564,9 @@ class TicketGenerator:
             reporter_id=reporter_id,
             assignee_id=assignee_id,
             team_id=team_id,
-            story_points=random.randint(1, 3),
-            created_at=datetime.now(),
-            updated_at=datetime.now(),
+            story_points=self.rng.randint(1, 3),
+            created_at=now,
+            updated_at=now,
             severity=TicketPriority.HIGH,
             steps_to_reproduce=steps_to_reproduce,
             actual_behavior=actual_behavior.strip(),
@@ -384,26 +574,29 @@ class TicketGenerator:
         )
         
         self.bugs[bug_id] = bug
+        self._register_ticket(bug)
         return bug
 
     def generate_comment(self, ticket: Ticket, author: TeamMember) -> Comment:
         """Generate a comment for a ticket."""
+        comment_id = f"CMT-{self.comment_counter}"
+        self.comment_counter += 1
         return Comment(
-            id=generate_id("CMT"),
+            id=comment_id,
             author_id=author.id,
             content="This is a sample comment.",
-            created_at=datetime.now(),
-            reactions={"👍": [random.choice(list(self.team_members.keys()))]}
+            created_at=self._now(),
+            reactions={"👍": [self.rng.choice(self._member_pool())]}
         )
 
     def generate_sprints_for_team(self, team_id: str, num_sprints: int) -> List[Sprint]:
         """Generate sprints for a team."""
         sprints = []
-        current_date = datetime.now()
+        current_date = self._now()
         
         for i in range(num_sprints):
             sprint = Sprint(
-                id=generate_id("SPR"),
+                id=self._seeded_id("SPR", team_id),
                 name=f"Sprint {i+1}",
                 goal=f"Complete sprint {i+1} goals",
                 start_date=current_date + timedelta(days=i*14),
@@ -413,25 +606,66 @@ class TicketGenerator:
             )
             sprints.append(sprint)
             self.sprints[sprint.id] = sprint
+        self._sprints_by_team.setdefault(team_id, []).extend(sprints)
         
         return sprints
 
+    def _register_ticket(self, ticket: Ticket):
+        """Add a ticket to the query indexes."""
+        self._all_tickets[ticket.id] = ticket
+        if ticket.sprint_id:
+            self._tickets_by_sprint.setdefault(ticket.sprint_id, []).append(ticket)
+        self._tickets_by_status.setdefault(ticket.status, {})[ticket.id] = ticket
+
+    def _set_ticket_sprint(self, ticket: Ticket, sprint_id: Optional[str]):
+        """Set a ticket's sprint and keep the query indexes in sync."""
+        if ticket.id in self._all_tickets and ticket.sprint_id != sprint_id:
+            if ticket.sprint_id:
+                self._tickets_by_sprint[ticket.sprint_id].remove(ticket)
+            if sprint_id:
+                self._tickets_by_sprint.setdefault(sprint_id, []).append(ticket)
+        ticket.sprint_id = sprint_id
+
+    def _set_ticket_status(self, ticket: Ticket, status: TicketStatus):
+        """Set a ticket's status and keep the query indexes in sync."""
+        if ticket.id in self._all_tickets and ticket.status != status:
+            del self._tickets_by_status[ticket.status][ticket.id]
+            self._tickets_by_status.setdefault(status, {})[ticket.id] = ticket
+        ticket.status = status
+
     def assign_ticket_to_sprint(self, ticket: Ticket, sprint: Sprint):
         """Assign a ticket to a sprint."""
-        if not isinstance(ticket, Epic):  # Don't assign epics to sprints
-            ticket.sprint_id = sprint.id
+        if ticket.type != TicketType.EPIC:  # Don't assign epics to sprints
+            self._set_ticket_sprint(ticket, sprint.id)
             if sprint.id in self.sprints:
                 self.sprints[sprint.id].tickets.append(ticket.id)
 
+    def assign_tickets_to_sprint(self, tickets: List[Ticket], sprint: Sprint):
+        """Assign several tickets to a sprint in one pass."""
+        assigned = [ticket for ticket in tickets if ticket.type != TicketType.EPIC]  # Don't assign epics to sprints
+        for ticket in assigned:
+            self._set_ticket_sprint(ticket, sprint.id)
+        if sprint.id in self.sprints:
+            self.sprints[sprint.id].tickets.extend(ticket.id for ticket in assigned)
+
     def _create_dependencies(self, ticket: Ticket, available_tickets: List[Ticket]):
         """Create dependencies between tickets."""
         if not available_tickets:
             return
 
         # Randomly create dependencies
-        if random.random() < self.dependency_probability:
-            num_dependencies = random.randint(1, min(2, len(available_tickets)))
-            dependencies = random.sample(available_tickets, num_dependencies)
+        if self.rng.random() < self.dependency_probability:
+            # At most two picks, so draw indexes directly instead of self.rng.sample
+            n = len(available_tickets)
+            num_dependencies = self.rng.randint(1, min(2, n))
+            i = self.rng.randrange(n)
+            if num_dependencies == 1:
+                dependencies = (available_tickets[i],)
+            else:
+                j = self.rng.randrange(n - 1)
+                if j >= i:
+                    j += 1
+                dependencies = (available_tickets[i], available_tickets[j])
             
             for dep in dependencies:
                 # Avoid circular dependencies
@@ -441,20 +675,10 @@ class TicketGenerator:
 
     def _create_blocking_issue(self, ticket: Ticket):
         """Create a blocking issue for a ticket."""
-        if random.random() < self.blocking_probability:
-            blocking_reasons = [
-                "Waiting for external API documentation",
-                "Pending security review",
-                "Infrastructure upgrade required",
-                "Dependent service not yet available",
-                "Awaiting client feedback",
-                "Technical debt needs to be addressed first",
-                "Resource constraints"
-            ]
-            
-            ticket.status = TicketStatus.BLOCKED
-            ticket.blocking_reason = random.choice(blocking_reasons)
-            ticket.blocked_since = datetime.now() - timedelta(days=random.randint(1, 5))
+        if self.rng.random() < self.blocking_probability:
+            self._set_ticket_status(ticket, TicketStatus.BLOCKED)
+            ticket.blocking_reason = self.rng.choice(BLOCKING_REASONS)
+            ticket.blocked_since = self._now() - timedelta(days=self.rng.randint(1, 5))
 
     def _create_relationship(
         self,
@@ -464,75 +688,131 @@ class TicketGenerator:
         note: str = None
     ):
         """Create a relationship between two tickets."""
-        # Get the corresponding reverse relationship
-        reverse_relations = {
-            TicketRelationType.BLOCKS: TicketRelationType.BLOCKED_BY,
-            TicketRelationType.CLONES: TicketRelationType.CLONED_BY,
-            TicketRelationType.DUPLICATES: TicketRelationType.DUPLICATED_BY,
-            TicketRelationType.IMPLEMENTS: TicketRelationType.IMPLEMENTED_BY,
-            TicketRelationType.DEPENDS_ON: TicketRelationType.REQUIRED_FOR
-        }
-        
-        # Get the appropriate list attributes
-        forward_attr = relation_type.value.replace(" ", "_")
-        reverse_attr = reverse_relations[relation_type].value.replace(" ", "_")
+        forward_list, reverse_list = _RELATION_DISPATCH[relation_type]
         
         # Add the relationship
-        getattr(source_ticket, forward_attr).append(target_ticket.id)
-        getattr(target_ticket, reverse_attr).append(source_ticket.id)
+        forward_list(source_ticket).append(target_ticket.id)
+        reverse_list(target_ticket).append(source_ticket.id)
         
         # Add relationship note if provided
         if note:
-            if forward_attr not in source_ticket.relationship_notes:
-                source_ticket.relationship_notes[forward_attr] = {}
-            source_ticket.relationship_notes[forward_attr][target_ticket.id] = note
+            notes = source_ticket.relationship_notes.setdefault(_RELATION_ATTRS[relation_type], {})
+            notes[target_ticket.id] = note
 
     def _handle_clones_and_duplicates(self, tickets: List[Ticket]):
         """Handle clone and duplicate relationships between tickets."""
-        for ticket in tickets:
+        # Duplicates share type and component set, so bucket tickets by that key once
+        masks = [_component_mask(t.components) for t in tickets]
+        duplicate_buckets: Dict[Tuple[TicketType, int], List[Ticket]] = {}
+        bucket_positions: Dict[str, int] = {}
+        for t, mask in zip(tickets, masks):
+            bucket = duplicate_buckets.setdefault((t.type, mask), [])
+            bucket_positions[t.id] = len(bucket)
+            bucket.append(t)
+        # Clone candidates per component: tickets touching any other component
+        clone_pools: Dict[Component, List[Ticket]] = {}
+        
+        for ticket, ticket_mask in zip(tickets, masks):
             # Handle clones (similar tickets in different components)
-            if (random.random() < self.clone_probability and 
+            if (self.rng.random() < self.clone_probability and 
                 len(ticket.components) == 1):  # Only clone single-component tickets
                 
-                # Find a ticket in a different component
-                other_components = [c for c in Component if c not in ticket.components]
-                if other_components and tickets:
-                    clone_candidates = [t for t in tickets 
-                                     if t.id != ticket.id and 
-                                     any(c in other_components for c in t.components)]
-                    if clone_candidates:
-                        clone_ticket = random.choice(clone_candidates)
-                        note = f"Similar functionality needed in {clone_ticket.components[0].value}"
-                        self._create_relationship(ticket, clone_ticket, TicketRelationType.CLONES, note)
+                # Find a ticket in a different component; the source itself never qualifies
+                component = ticket.components[0]
+                if component not in clone_pools:
+                    others = ~_COMPONENT_BITS[component]
+                    clone_pools[component] = [t for t, mask in zip(tickets, masks) if mask & others]
+                clone_candidates = clone_pools[component]
+                if clone_candidates:
+                    clone_ticket = self.rng.choice(clone_candidates)
+                    note = f"Similar functionality needed in {clone_ticket.components[0].value}"
+                    self._create_relationship(ticket, clone_ticket, TicketRelationType.CLONES, note)
             
             # Handle duplicates (exactly same issue reported multiple times)
-            if random.random() < self.duplicate_probability:
-                duplicate_candidates = [t for t in tickets 
-                                     if t.id != ticket.id and 
-                                     t.type == ticket.type and
-                                     set(t.components) == set(ticket.components)]
-                if duplicate_candidates:
-                    duplicate_ticket = random.choice(duplicate_candidates)
+            if self.rng.random() < self.duplicate_probability:
+                bucket = duplicate_buckets[(ticket.type, ticket_mask)]
+                if len(bucket) > 1:
+                    # Pick among the bucket minus the source ticket without copying it
+                    index = self.rng.randrange(len(bucket) - 1)
+                    if index >= bucket_positions[ticket.id]:
+                        index += 1
+                    duplicate_ticket = bucket[index]
                     note = "Exact same issue reported separately"
                     self._create_relationship(ticket, duplicate_ticket, TicketRelationType.DUPLICATES, note)
 
     def _handle_implementations(self, stories: List[Story], tasks: List[Task]):
         """Handle implementation relationships between stories and tasks."""
+        # Index task positions by component so each story only visits tasks sharing one
+        task_rows: Dict[Component, List[int]] = {}
+        for row, task in enumerate(tasks):
+            for component in task.components:
+                task_rows.setdefault(component, []).append(row)
+        
         for story in stories:
-            if random.random() < self.implements_probability:
-                # Find tasks that could implement this story
-                implement_candidates = [t for t in tasks 
-                                     if t.id != story.id and 
-                                     any(c in story.components for c in t.components)]
+            if self.rng.random() < self.implements_probability:
+                # Find tasks that could implement this story, in their original order
+                rows = set()
+                for component in story.components:
+                    rows.update(task_rows.get(component, ()))
+                implement_candidates = [tasks[row] for row in sorted(rows)]
                 if implement_candidates:
-                    num_implementers = random.randint(1, min(3, len(implement_candidates)))
-                    implementers = random.sample(implement_candidates, num_implementers)
+                    num_implementers = self.rng.randint(1, min(3, len(implement_candidates)))
+                    implementers = self.rng.sample(implement_candidates, num_implementers)
                     for task in implementers:
                         note = f"Technical implementation of {story.summary}"
                         self._create_relationship(task, story, TicketRelationType.IMPLEMENTS, note)
 
-    def generate_sprint_tickets(self, sprint_id: str, team_id: str, num_tickets: int) -> List[Ticket]:
-        """Generate tickets for a sprint."""
+    async def _adescribe(self, title: str, ticket_type: str, prompt: Union[str, Callable[[], str]]) -> Tuple[str, str]:
+        """Generate a ticket description and its summary."""
+        if self.llm.combined_summary:
+            return await self.llm.agenerate_ticket_payload(title, ticket_type, prompt)
+        description = await self.llm.agenerate_ticket_description(title=title, ticket_type=ticket_type, prompt=prompt)
+        summary = await self.llm.agenerate_summary(description, ticket_type)
+        return description, summary
+
+    async def _asubtask(self, task: Task) -> Tuple[Tuple[str, int], str]:
+        """Generate a subtask's (description, story_points) and its summary."""
+        content = await self.llm.agenerate_subtask(
+            task_description=task.description,
+            task_id=task.id
+        )
+        summary = await self.llm.agenerate_summary(content[0], "Subtask")
+        return content, summary
+
+    def generate_epics(self, count: int) -> List[Epic]:
+        """Generate several epics, running their LLM calls concurrently."""
+        initiative = self.current_initiative
+        title = self._ticket_title("Epic", initiative)
+        prompt = self._epic_prompt(initiative)
+        results = self.llm.run_concurrently([self._adescribe(title, "Epic", prompt) for _ in range(count)])
+        return [self.generate_epic(title, description, summary) for description, summary in results]
+
+    def _pick_parents(self, count: int, existing: List[Ticket], num_new: int) -> List[Union[Ticket, int]]:
+        """Pick a parent for each of count children from existing tickets plus num_new pending ones.
+        
+        Pending parents are returned as their index among the new tickets.
+        """
+        pool_size = len(existing) + num_new
+        if pool_size == 0:
+            return []
+        picks = []
+        for _ in range(count):
+            index = self.rng.randrange(pool_size)
+            picks.append(existing[index] if index < len(existing) else index - len(existing))
+        return picks
+
+    def generate_sprint_tickets(
+        self,
+        sprint_id: str,
+        team_id: str,
+        num_tickets: int,
+        epic: Optional[Epic] = None
+    ) -> List[Ticket]:
+        """Generate tickets for a sprint.
+        
+        If an epic is passed, stories are linked to it and no new epics are
+        generated for the sprint.
+        """
         if sprint_id not in self.sprints:
             raise ValueError(f"Sprint {sprint_id} not found")
             
@@ -540,64 +820,136 @@ class TicketGenerator:
             raise ValueError(f"Team {team_id} not found")
             
         sprint = self.sprints[sprint_id]
-        team = self.teams[team_id]
-        tickets = []
-        
-        # Calculate number of each ticket type
-        num_stories = int(num_tickets * 0.4)  # 40% stories
-        num_tasks = int(num_tickets * 0.3)    # 30% tasks
-        num_subtasks = int(num_tickets * 0.2)  # 20% subtasks
-        num_bugs = num_tickets - (num_stories + num_tasks + num_subtasks)  # Remaining as bugs
-        
-        # Generate epics first (1-2 per sprint)
-        num_epics = random.randint(1, 2)
-        for _ in range(num_epics):
-            epic = self.generate_epic()
-            self.assign_ticket_to_sprint(epic, sprint)
-            tickets.append(epic)
-        
-        # Generate stories
-        for _ in range(num_stories):
-            if self.epics:
-                epic = random.choice(list(self.epics.values()))
-                story = self.generate_story(epic)
-            else:
-                story = self.generate_story(None)  # Default to backend for now
-            self.assign_ticket_to_sprint(story, sprint)
-            tickets.append(story)
-        
-        # Generate tasks
-        for _ in range(num_tasks):
-            task = self.generate_task()
-            self.assign_ticket_to_sprint(task, sprint)
-            tickets.append(task)
-        
-        # Generate subtasks
-        for _ in range(num_subtasks):
-            if self.tasks:
-                parent_task = random.choice(list(self.tasks.values()))
-                subtask = self.generate_subtask(parent_task)
-                self.assign_ticket_to_sprint(subtask, sprint)
-                tickets.append(subtask)
-        
-        # Generate bugs
-        for _ in range(num_bugs):
-            bug = self.generate_bug()
-            self.assign_ticket_to_sprint(bug, sprint)
-            tickets.append(bug)
-        
-        # Create dependencies between tickets
-        self._create_dependencies(tickets[0], tickets[1:])
-        
-        # Handle clones and duplicates
-        self._handle_clones_and_duplicates(tickets)
-        
-        # Handle implementations
-        stories = [t for t in tickets if isinstance(t, Story)]
-        tasks = [t for t in tickets if isinstance(t, Task)]
-        self._handle_implementations(stories, tasks)
-        
-        return tickets
+        
+        # Tickets share one timestamp per sprint outside a hierarchy run, which pins its own
+        pinned = self._run_now is None
+        if pinned:
+            self._run_now = datetime.now()
+        try:
+            return self._generate_sprints([(sprint, num_tickets, epic)])[0]
+        finally:
+            if pinned:
+                self._run_now = None
+
+    def _generate_sprints(self, specs: List[Tuple[Sprint, int, Optional[Epic]]]) -> List[List[Ticket]]:
+        """Generate the tickets of several (sprint, num_tickets, epic) specs, sharing their LLM rounds.
+        
+        Every spec is planned before any request is made, so all sprints' descriptions go out
+        together: one round for tickets whose inputs are ready, and one for the stories and
+        subtasks whose parent is generated in the same call. With the Batch API that keeps the
+        number of batch jobs independent of how many sprints are generated.
+        """
+        # Titles and the epic/task/bug prompts only depend on the initiative, so build them once
+        initiative = self.current_initiative
+        titles = {
+            ticket_type: self._ticket_title(ticket_type, initiative)
+            for ticket_type in ("Epic", "Story", "Task", "Bug")
+        }
+        prompts = {
+            "Epic": self._epic_prompt(initiative),
+            "Task": self._task_prompt(initiative),
+            "Bug": self._bug_prompt(initiative)
+        }
+        
+        def story_job(story_epic):
+            # Built lazily; fast mode never renders the epic-specific prompt
+            prompt = partial(self._story_prompt, initiative, story_epic.description if story_epic else None)
+            return self._adescribe(titles["Story"], "Story", prompt)
+        
+        # Pick every story's epic and subtask's parent up front. A pick is either an existing
+        # ticket or the index of one generated in this call; only the latter must wait for
+        # their parent's description, so everything else goes out in the first round.
+        existing_epics = list(self.epics.values())
+        existing_tasks = list(self.tasks.values())
+        num_new_epics = num_new_tasks = 0
+        plans = []
+        for sprint, num_tickets, epic in specs:
+            # Calculate number of each ticket type
+            num_stories = int(num_tickets * 0.4)  # 40% stories
+            num_tasks = int(num_tickets * 0.3)    # 30% tasks
+            num_subtasks = int(num_tickets * 0.2)  # 20% subtasks
+            num_bugs = num_tickets - (num_stories + num_tasks + num_subtasks)  # Remaining as bugs
+            
+            num_epics = 0 if epic is not None else self.rng.randint(1, 2)  # 1-2 per sprint unless the caller owns the epic
+            num_new_epics += num_epics
+            num_new_tasks += num_tasks
+            story_epics = self._pick_parents(num_stories, [epic] if epic is not None else existing_epics,
+                                             0 if epic is not None else num_new_epics)
+            subtask_parents = self._pick_parents(num_subtasks, existing_tasks, num_new_tasks)
+            plans.append({
+                "sprint": sprint,
+                "num_epics": num_epics,
+                "num_tasks": num_tasks,
+                "num_bugs": num_bugs,
+                "num_llm_bugs": 0 if self.synthetic_bugs else num_bugs,
+                "story_epics": story_epics,
+                "subtask_parents": subtask_parents,
+                "ready_stories": [i for i, pick in enumerate(story_epics) if not isinstance(pick, int)],
+                "ready_subtasks": [i for i, pick in enumerate(subtask_parents) if not isinstance(pick, int)]
+            })
+        
+        first_jobs = []
+        for plan in plans:
+            first_jobs.extend(self._adescribe(titles["Epic"], "Epic", prompts["Epic"]) for _ in range(plan["num_epics"]))
+            first_jobs.extend(self._adescribe(titles["Task"], "Task", prompts["Task"]) for _ in range(plan["num_tasks"]))
+            first_jobs.extend(self._adescribe(titles["Bug"], "Bug", prompts["Bug"]) for _ in range(plan["num_llm_bugs"]))
+            first_jobs.extend(story_job(plan["story_epics"][i]) for i in plan["ready_stories"])
+            first_jobs.extend(self._asubtask(plan["subtask_parents"][i]) for i in plan["ready_subtasks"])
+        first_round = iter(self.llm.run_concurrently(first_jobs))
+        
+        # Build each sprint's epics, tasks and bugs in order, so ticket ids follow the specs
+        new_epics: List[Epic] = []
+        new_tasks: List[Task] = []
+        for plan in plans:
+            plan["epics"] = [self.generate_epic(titles["Epic"], *next(first_round)) for _ in range(plan["num_epics"])]
+            plan["tasks"] = [self.generate_task(titles["Task"], *next(first_round)) for _ in range(plan["num_tasks"])]
+            bugs = []
+            for _ in range(plan["num_llm_bugs"]):
+                description, summary = next(first_round)
+                bugs.append(self.generate_bug(title=titles["Bug"], description=description, summary=summary))
+            bugs.extend(self.generate_bug(title=titles["Bug"]) for _ in range(plan["num_bugs"] - plan["num_llm_bugs"]))
+            plan["bugs"] = bugs
+            plan["story_results"] = {i: next(first_round) for i in plan["ready_stories"]}
+            plan["subtask_results"] = {i: next(first_round) for i in plan["ready_subtasks"]}
+            new_epics.extend(plan["epics"])
+            new_tasks.extend(plan["tasks"])
+        
+        # Resolve picks of the new epics and tasks, then describe their children in one more round
+        second_jobs = []
+        for plan in plans:
+            plan["story_epics"] = [new_epics[pick] if isinstance(pick, int) else pick for pick in plan["story_epics"]]
+            plan["subtask_parents"] = [new_tasks[pick] if isinstance(pick, int) else pick for pick in plan["subtask_parents"]]
+            plan["waiting_stories"] = [i for i in range(len(plan["story_epics"])) if i not in plan["story_results"]]
+            plan["waiting_subtasks"] = [i for i in range(len(plan["subtask_parents"])) if i not in plan["subtask_results"]]
+            second_jobs.extend(story_job(plan["story_epics"][i]) for i in plan["waiting_stories"])
+            second_jobs.extend(self._asubtask(plan["subtask_parents"][i]) for i in plan["waiting_subtasks"])
+        second_round = iter(self.llm.run_concurrently(second_jobs))
+        
+        results = []
+        for plan in plans:
+            plan["story_results"].update((i, next(second_round)) for i in plan["waiting_stories"])
+            plan["subtask_results"].update((i, next(second_round)) for i in plan["waiting_subtasks"])
+            epics, tasks, bugs = plan["epics"], plan["tasks"], plan["bugs"]
+            stories = [self.generate_story(epic, titles["Story"], *plan["story_results"][i])
+                       for i, epic in enumerate(plan["story_epics"])]
+            subtasks = [self.generate_subtask(task, *plan["subtask_results"][i])
+                        for i, task in enumerate(plan["subtask_parents"])]
+            
+            tickets = epics + stories + tasks + subtasks + bugs
+            self.assign_tickets_to_sprint(tickets, plan["sprint"])
+            
+            # Create dependencies between tickets
+            if tickets:
+                self._create_dependencies(tickets[0], tickets[1:])
+            
+            # Handle clones and duplicates
+            self._handle_clones_and_duplicates(tickets)
+            
+            # Handle implementations
+            self._handle_implementations(stories, tasks)
+            
+            results.append(tickets)
+        return results
 
     def generate_ticket_hierarchy(self) -> Dict[str, List[Ticket]]:
         """Generate a complete ticket hierarchy with epics, stories, tasks, and bugs."""
@@ -609,43 +961,41 @@ class TicketGenerator:
             "bugs": []
         }
         
-        # Generate epics for each component
-        for component in Component:
-            epic = self.generate_epic()
-            result["epics"].append(epic)
+        # Every ticket of the run shares one timestamp
+        self._run_now = datetime.now()
+        try:
+            # Generate epics for each component, describing them in one concurrent round
+            specs = []
+            for component, epic in zip(Component, self.generate_epics(len(Component))):
+                result["epics"].append(epic)
+                
+                # Generate sprints for each team
+                for team in self.teams.values():
+                    sprints = self.generate_sprints_for_team(team.id, self.stories_per_sprint)
+                    specs.extend((sprint, self.config.get('tickets_per_sprint', 10), epic) for sprint in sprints)
             
-            # Generate sprints for each team
-            for team in self.teams.values():
-                sprints = self.generate_sprints_for_team(team.id, self.stories_per_sprint)
+            # Generate every sprint's tickets together, so their LLM requests share rounds
+            for (_, _, epic), sprint_tickets in zip(specs, self._generate_sprints(specs)):
+                stories = [t for t in sprint_tickets if t.type == TicketType.STORY]
+                result["stories"].extend(stories)
+                result["tasks"].extend(t for t in sprint_tickets if t.type == TicketType.TASK)
+                result["subtasks"].extend(t for t in sprint_tickets if t.type == TicketType.SUBTASK)
+                result["bugs"].extend(t for t in sprint_tickets if t.type == TicketType.BUG)
                 
-                # Generate tickets for each sprint
-                for sprint in sprints:
-                    sprint_tickets = self.generate_sprint_tickets(sprint.id, team.id, len(sprint_tickets))
-                    result["stories"].extend(sprint_tickets[1:])
-                    result["tasks"].extend(sprint_tickets[2:])
-                    result["subtasks"].extend(sprint_tickets[3:])
-                    result["bugs"].extend([sprint_tickets[0] if isinstance(sprint_tickets[0], Bug) else None])
-                    
-                    # Link stories to epic
-                    for story in sprint_tickets[1:]:
-                        if isinstance(story, Story):
-                            epic.child_stories.append(story.id)
+                # Link stories to epic
+                epic.child_stories.extend(t.id for t in stories)
+        finally:
+            self._run_now = None
         
         return result
 
-    def get_all_tickets(self) -> Dict[str, Ticket]:
-        """Return all generated tickets."""
-        return {
-            **self.epics,
-            **self.stories,
-            **self.tasks,
-            **self.subtasks,
-            **self.bugs
-        }
+    def get_all_tickets(self) -> Mapping[str, Ticket]:
+        """Return a read-only view of all generated tickets."""
+        return MappingProxyType(self._all_tickets)
 
     def get_ticket_by_id(self, ticket_id: str) -> Optional[Ticket]:
         """Get a ticket by its ID."""
-        return self.get_all_tickets().get(ticket_id)
+        return self._all_tickets.get(ticket_id)
 
     def get_sprint_by_id(self, sprint_id: str) -> Optional[Sprint]:
         """Get a sprint by its ID."""
@@ -653,24 +1003,21 @@ class TicketGenerator:
 
     def get_team_sprints(self, team_id: str) -> List[Sprint]:
         """Get all sprints for a team."""
-        return [sprint for sprint in self.sprints.values() if sprint.team_id == team_id]
+        return list(self._sprints_by_team.get(team_id, []))
 
     def get_sprint_tickets(self, sprint_id: str) -> List[Ticket]:
         """Get all tickets in a sprint."""
         sprint = self.get_sprint_by_id(sprint_id)
         if not sprint:
             return []
-        return [ticket for ticket in self.get_all_tickets().values() 
-                if ticket.sprint_id == sprint_id]
+        return list(self._tickets_by_sprint.get(sprint_id, []))
 
     def get_blocked_tickets(self, sprint_id: str = None) -> List[Ticket]:
         """Get all blocked tickets, optionally filtered by sprint."""
-        all_tickets = self.get_all_tickets().values()
-        blocked_tickets = [t for t in all_tickets if t.status == TicketStatus.BLOCKED]
-        
+        blocked = self._tickets_by_status.get(TicketStatus.BLOCKED, {})
         if sprint_id:
-            return [t for t in blocked_tickets if t.sprint_id == sprint_id]
-        return blocked_tickets
+            return [t for t in blocked.values() if t.sprint_id == sprint_id]
+        return list(blocked.values())
 
     def get_ticket_dependencies(self, ticket_id: str) -> Dict[str, List[str]]:
         """Get all dependencies for a ticket."""
@@ -684,6 +1031,14 @@ class TicketGenerator:
             "blocks": ticket.blocks
         }
 
+    def iter_ticket_dependencies(self) -> Iterator[Tuple[str, str, str]]:
+        """Yield ("blocking", blocker_id, blocked_id) and ("dependencies", dependent_id, dependency_id) edges for all tickets."""
+        for ticket in self._all_tickets.values():
+            for blocked_id in ticket.blocks:
+                yield "blocking", ticket.id, blocked_id
+            for dep_id in ticket.depends_on:
+                yield "dependencies", ticket.id, dep_id
+
     def get_sprint_dependencies(self, sprint_id: str) -> Dict[str, List[tuple[str, str]]]:
         """Get all dependencies between tickets in a sprint."""
         sprint_tickets = self.get_sprint_tickets(sprint_id)
@@ -693,14 +1048,17 @@ class TicketGenerator:
             "dependencies": []  # List of (dependent_id, dependency_id) tuples
         }
         
+        blocking = dependencies["blocking"]
+        depends = dependencies["dependencies"]
         for ticket in sprint_tickets:
+            ticket_id = ticket.id
             # Add blocking relationships
-            for blocked_id in ticket.blocks:
-                dependencies["blocking"].append((ticket.id, blocked_id))
+            if ticket.blocks:
+                blocking.extend((ticket_id, blocked_id) for blocked_id in ticket.blocks)
             
             # Add dependencies
-            for dep_id in ticket.depends_on:
-                dependencies["dependencies"].append((ticket.id, dep_id))
+            if ticket.depends_on:
+                depends.extend((ticket_id, dep_id) for dep_id in ticket.depends_on)
         
         return dependencies
 
@@ -711,119 +1069,148 @@ class TicketGenerator:
             return {}
         
         relationships = {
-            "outgoing": {},  # relationships where this ticket is the source
-            "incoming": {}   # relationships where this ticket is the target
+            "outgoing": defaultdict(list),  # relationships where this ticket is the source
+            "incoming": defaultdict(list)   # relationships where this ticket is the target
         }
         
-        # Helper to add relationships to the result
-        def add_relationship(rel_type: str, target_id: str, direction: str):
-            if rel_type not in relationships[direction]:
-                relationships[direction][rel_type] = []
-            note = ticket.relationship_notes.get(rel_type, {}).get(target_id)
-            relationships[direction][rel_type].append((target_id, note))
-        
-        # Add all relationship types
-        for rel_type in TicketRelationType:
-            attr_name = rel_type.value.replace(" ", "_")
-            if hasattr(ticket, attr_name):
-                related_ids = getattr(ticket, attr_name)
-                for related_id in related_ids:
-                    add_relationship(attr_name, related_id, "outgoing")
+        # Add all relationship types, looking up each type's notes once
+        for attr_name in _TICKET_RELATION_ATTRS:
+            related_ids = getattr(ticket, attr_name)
+            if related_ids:
+                notes = ticket.relationship_notes.get(attr_name) or {}
+                relationships["outgoing"][attr_name].extend(
+                    (related_id, notes.get(related_id)) for related_id in related_ids
+                )
+        
+        # Plain dicts, so reading a missing relation type cannot insert an empty list
+        return {direction: dict(by_type) for direction, by_type in relationships.items()}
 
     def set_product_initiative(self, initiative_name: str):
         """Set the current product initiative."""
         self.current_initiative = initiative_name
+        # Resolve and join the initiative's prompt values once rather than per ticket
+        self._current_initiative_fields = (initiative_name, self._initiative_fields(initiative_name))
 
     def generate_ticket(self, ticket_type: TicketType) -> Ticket:
         """Generate a ticket of the specified type."""
+        now = self._now()
         reporter_id, assignee_id = self._assign_team_member()
         
         # Get team_id from the assignee's team
-        team_id = None
-        for team in self.teams.values():
-            if any(member.id == assignee_id for member in team.members):
-                team_id = team.id
-                break
+        team_id = self._member_teams.get(assignee_id)
 
         ticket = Ticket(
-            id=generate_id("TKT"),
+            id=self._seeded_id("TKT"),
             type=ticket_type,
             summary=f"Sample {ticket_type.value} ticket",
             description=f"This is a sample {ticket_type.value} ticket for testing purposes.",
-            status=TicketStatus.TODO,
+            status=TicketStatus.TO_DO,
             priority="Medium",
             reporter_id=reporter_id,
             assignee_id=assignee_id,
             team_id=team_id,
-            created_at=datetime.now(),
-            updated_at=datetime.now()
+            created_at=now,
+            updated_at=now
         )
         
         self.tickets[ticket.id] = ticket
+        self._register_ticket(ticket)
         return ticket
 
-    def _generate_epic_description(self, initiative, scenarios):
-        """Generate a detailed epic description using GPT-4."""
-        prompt = f"""Generate a detailed epic description for a software development project with the following context:
+    def _ticket_title(self, ticket_type: str, initiative) -> str:
+        """Build the canonical LLM title for a ticket type and initiative."""
+        label = initiative.get('description', 'Initiative') if isinstance(initiative, dict) else initiative
+        return f"{ticket_type}: {label}"
+
+    def _initiative_fields(self, initiative) -> Dict[str, str]:
+        """Resolve the initiative values substituted into the prompt templates."""
+        if self._current_initiative_fields and self._current_initiative_fields[0] is initiative:
+            return self._current_initiative_fields[1]
+        if isinstance(initiative, dict):
+            return {
+                "initiative": initiative.get('description', 'Not specified'),
+                "objectives": ', '.join(initiative['objectives']) if 'objectives' in initiative else 'Not specified',
+                "success_metrics": ', '.join(initiative['success_metrics']) if 'success_metrics' in initiative else 'Not specified'
+            }
+        return {
+            "initiative": initiative or 'Not specified',
+            "objectives": 'Not specified',
+            "success_metrics": 'Not specified'
+        }
 
-Initiative: {initiative if isinstance(initiative, str) else initiative.get('description', 'Not specified')}
-Objectives: {', '.join(initiative['objectives']) if isinstance(initiative, dict) and 'objectives' in initiative else 'Not specified'}
-Success Metrics: {', '.join(initiative['success_metrics']) if isinstance(initiative, dict) and 'success_metrics' in initiative else 'Not specified'}
+    def _initiative_prompt(self, ticket_type: str, initiative) -> str:
+        """Render a prompt template that only depends on the initiative, cached per initiative name."""
+        if isinstance(initiative, dict):
+            return PROMPT_TEMPLATES[ticket_type].format_map(self._initiative_fields(initiative))
+        key = (ticket_type, initiative)
+        if key not in self._prompt_cache:
+            self._prompt_cache[key] = PROMPT_TEMPLATES[ticket_type].format_map(self._initiative_fields(initiative))
+        return self._prompt_cache[key]
 
-Generate a comprehensive description that covers the initiative's goals, challenges, and implementation approach. Make it detailed, realistic, and specific to the initiative while keeping it generic enough to apply to any software project."""
+    def _epic_prompt(self, initiative) -> str:
+        """Build the LLM prompt for an epic description."""
+        return self._initiative_prompt("Epic", initiative)
+
+    def _generate_epic_description(self, initiative, scenarios, title=None):
+        """Generate a detailed epic description using GPT-4."""
+        prompt = self._epic_prompt(initiative)
 
         return self.llm.generate_ticket_description(
-            title=f"Epic: {initiative.get('description', 'Initiative') if isinstance(initiative, dict) else initiative}",
+            title=title or self._ticket_title("Epic", initiative),
             ticket_type="Epic",
             prompt=prompt
         )
 
-    def _generate_story_description(self, scenarios, initiative=None, epic_description=None):
-        """Generate a detailed story description using GPT-4."""
-        prompt = f"""Generate a detailed story description for a software development project with the following context:
-
-Initiative: {initiative['description'] if isinstance(initiative, dict) and 'description' in initiative else 'Not specified'}
-
-Epic Description: {epic_description if epic_description else 'Not specified'}
-
-Please follow the user story format:
-As a [type of user], I want [goal] so that [benefit]
-
-Then provide additional details about:
-1. Acceptance criteria
+    def _story_prompt(self, initiative, epic_description=None) -> str:
+        """Build the LLM prompt for a story description."""
+        return PROMPT_TEMPLATES["Story"].format(
+            epic_description=epic_description or 'Not specified',
+            **self._initiative_fields(initiative)
+        )
 
-Make the description detailed, realistic, and specific to the epic and initiative while keeping it generic enough to apply to any software project. If an epic description is provided, ensure the story aligns with the epic's goals and scope."""
+    def _generate_story_description(self, scenarios, initiative=None, epic_description=None, title=None):
+        """Generate a detailed story description using GPT-4."""
+        prompt = partial(self._story_prompt, initiative, epic_description)
 
         return self.llm.generate_ticket_description(
-            title=f"Story: {initiative.get('description', 'Initiative') if isinstance(initiative, dict) else initiative}",
+            title=title or self._ticket_title("Story", initiative),
             ticket_type="Story",
             prompt=prompt
         )
 
-    def _generate_bug_description(self, scenarios, initiative):
-        """Generate a realistic bug description using GPT-4."""
-        prompt = f"""Generate a detailed bug report for a software development project with the following context:
+    def _synthetic_bug(self) -> Tuple[str, str]:
+        """Pick a pre-written bug report and return its (description, summary)."""
+        template = self.rng.choice(BUG_TEMPLATES)
+        initiative = self._initiative_fields(self.current_initiative)["initiative"]
+        if initiative == 'Not specified':
+            # Templates read "... for {initiative} ..."; keep them grammatical without an initiative
+            initiative = "the product"
+        return template["description"].format(initiative=initiative), template["summary"]
 
-Initiative: {initiative['description'] if isinstance(initiative, dict) and 'description' in initiative else 'Not specified'}
+    def _bug_prompt(self, initiative) -> str:
+        """Build the LLM prompt for a bug description."""
+        return self._initiative_prompt("Bug", initiative)
 
-Generate a comprehensive bug report that includes the issue description, impact, and any relevant technical details. Make it detailed, realistic, and specific to the initiative while keeping it generic enough to apply to any software project."""
+    def _generate_bug_description(self, scenarios, initiative, title=None):
+        """Generate a realistic bug description using GPT-4."""
+        prompt = self._bug_prompt(initiative)
 
         return self.llm.generate_ticket_description(
-            title=f"Bug: {initiative.get('description', 'Initiative') if isinstance(initiative, dict) else initiative}",
+            title=title or self._ticket_title("Bug", initiative),
             ticket_type="Bug",
             prompt=prompt
         )
 
-    def _generate_task_description(self, scenarios, initiative):
-        """Generate a detailed technical task description using GPT-4."""
-        prompt = f"""Generate a detailed technical task description for a software development project with the following context:
-
-Initiative: {initiative['description'] if isinstance(initiative, dict) and 'description' in initiative else 'Not specified'}
+    def _task_prompt(self, initiative) -> str:
+        """Build the LLM prompt for a task description."""
+        return self._initiative_prompt("Task", initiative)
 
-Generate a comprehensive technical task description that includes the implementation details, requirements, and any relevant technical considerations. Make it detailed, realistic, and specific to the initiative while keeping it generic enough to apply to any software project."""
+    def _generate_task_description(self, scenarios, initiative, title=None):
+        """Generate a detailed technical task description using GPT-4."""
+        prompt = self._task_prompt(initiative)
 
         return self.llm.generate_ticket_description(
-            title=f"Task: {initiative.get('description', 'Initiative') if isinstance(initiative, dict) else initiative}",
+            title=title or self._ticket_title("Task", initiative),
             ticket_type="Task",
             prompt=prompt
         )